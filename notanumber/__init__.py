@@ -6,8 +6,10 @@ Come with me and you'll be in a world of pure imagination.
 
 from .core import (
     decode,
+    decode_iter,
     demo,
     encode,
+    encode_iter,
     from_inf,
     from_nan,
     from_subnormal,
@@ -22,6 +24,8 @@ __version__ = "0.2.0"
 __all__ = [
     "encode",
     "decode",
+    "encode_iter",
+    "decode_iter",
     "demo",
     "to_zero",
     "from_zero",
@@ -0,0 +1,506 @@
+/*
+ * Compiled kernels for notanumber.
+ *
+ * Optional: notanumber.core falls back to NumPy or pure Python when this
+ * extension is not built. All fp16 values are read and written
+ * little-endian, whatever the host.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+#define NAN_QUIET 0x7E00
+#define EXPONENT_MASK 0x7C00
+#define SIGN_BIT 0x8000
+
+enum { OK = 0, NOT_NAN, NOT_SUBNORMAL, NEGATIVE };
+
+/* Byte-at-a-time stores; compilers fold these into single moves. */
+static inline void
+put_le16(uint8_t *out, uint16_t v)
+{
+    out[0] = (uint8_t)v;
+    out[1] = (uint8_t)(v >> 8);
+}
+
+static inline void
+put_le32(uint8_t *out, uint32_t v)
+{
+    put_le16(out, (uint16_t)v);
+    put_le16(out + 2, (uint16_t)(v >> 16));
+}
+
+static inline void
+put_le64(uint8_t *out, uint64_t v)
+{
+    put_le32(out, (uint32_t)v);
+    put_le32(out + 4, (uint32_t)(v >> 32));
+}
+
+static inline uint32_t
+get_le32(const uint8_t *in)
+{
+    return (uint32_t)in[0] | (uint32_t)in[1] << 8 | (uint32_t)in[2] << 16 |
+           (uint32_t)in[3] << 24;
+}
+
+/*
+ * Slices bytes into width-bit chunks and ORs each with fill. A rolling
+ * 64-bit accumulator is refilled four bytes at a time; fewer than width bits
+ * are ever left over, so it never holds more than 41. No per-bit division.
+ * State carries across spans, so a header and its data can be packed as one
+ * stream without first gluing them together.
+ */
+typedef struct {
+    uint8_t *out;
+    uint64_t acc;
+    int nbits;
+    int width;
+    uint16_t fill;
+} packer;
+
+static inline void
+pack_drain(packer *p)
+{
+    const uint64_t mask = ((uint64_t)1 << p->width) - 1;
+    while (p->nbits >= p->width) {
+        put_le16(p->out, p->fill | (uint16_t)(p->acc & mask));
+        p->out += 2;
+        p->acc >>= p->width;
+        p->nbits -= p->width;
+    }
+}
+
+static void
+pack_span(packer *p, const uint8_t *in, Py_ssize_t n)
+{
+    Py_ssize_t i = 0;
+
+    for (; i + 4 <= n; i += 4) {
+        p->acc |= (uint64_t)get_le32(in + i) << p->nbits;
+        p->nbits += 32;
+        pack_drain(p);
+    }
+    for (; i < n; i++) {
+        p->acc |= (uint64_t)in[i] << p->nbits;
+        p->nbits += 8;
+        pack_drain(p);
+    }
+}
+
+/* Write out whatever is left as a last, zero-padded chunk. */
+static void
+pack_flush(packer *p)
+{
+    if (p->nbits > 0) {
+        const uint64_t mask = ((uint64_t)1 << p->width) - 1;
+        put_le16(p->out, p->fill | (uint16_t)(p->acc & mask));
+    }
+}
+
+/*
+ * Validate n fp16 values and concatenate their low width bits. Bad bits are
+ * ORed into one accumulator and only looked at after the loop, so valid
+ * input (the usual case) runs straight through without a branch per value.
+ * Returns the complaint, or OK.
+ */
+static int
+unpack_bits(const uint8_t *in, Py_ssize_t n, uint8_t *out, int width)
+{
+    const uint64_t mask = ((uint64_t)1 << width) - 1;
+    /* NaNs must have every quiet bit set; subnormals no exponent or sign */
+    const uint16_t flip = width == 9 ? NAN_QUIET : 0;
+    const uint16_t check = width == 9 ? NAN_QUIET : EXPONENT_MASK | SIGN_BIT;
+    uint16_t bad = 0;
+    uint64_t acc = 0;
+    int nbits = 0;
+
+    /* Drain four bytes at a time; at most 41 bits are ever held */
+    for (Py_ssize_t i = 0; i < n; i++) {
+        uint16_t v = (uint16_t)(in[2 * i] | (in[2 * i + 1] << 8));
+        bad |= (v ^ flip) & check;
+        acc |= (v & mask) << nbits;
+        nbits += width;
+        if (nbits >= 32) {
+            put_le32(out, (uint32_t)acc);
+            out += 4;
+            acc >>= 32;
+            nbits -= 32;
+        }
+    }
+    for (; nbits > 0; nbits -= 8) {
+        *out++ = (uint8_t)acc;
+        acc >>= 8;
+    }
+
+    if (width == 9) {
+        return bad ? NOT_NAN : OK;
+    }
+    return bad & EXPONENT_MASK ? NOT_SUBNORMAL : bad ? NEGATIVE : OK;
+}
+
+/*
+ * Spread each bit of n bytes into its own fp16 value: fill, plus the sign
+ * bit if the bit is set. Sixteen bytes out for every byte in.
+ */
+typedef void (*spread_fn)(const uint8_t *in, Py_ssize_t n, uint8_t *out,
+                          uint16_t fill);
+
+/*
+ * Portable SWAR: multiplying a nibble by 1 + 2^15 + 2^30 + 2^45 lays four
+ * copies of it side by side with no carries, so that bit k of copy k lands
+ * on bit 16k. One mask later there are four lanes of one bit each, ready to
+ * shift into the sign. Two 64-bit words out per input byte.
+ */
+static void
+spread_swar(const uint8_t *in, Py_ssize_t n, uint8_t *out, uint16_t fill)
+{
+    const uint64_t lanes = 0x0001000100010001ULL;
+    const uint64_t copies = 0x0000200040008001ULL;
+    const uint64_t base = fill * lanes;
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        uint64_t lo = ((uint64_t)(in[i] & 0xF) * copies) & lanes;
+        uint64_t hi = ((uint64_t)(in[i] >> 4) * copies) & lanes;
+        put_le64(out, base | lo << 15);
+        put_le64(out + 8, base | hi << 15);
+        out += 16;
+    }
+}
+
+#if defined(__GNUC__) && defined(__x86_64__)
+#define HAVE_X86_DISPATCH 1
+#include <immintrin.h>
+
+/* Two bytes per step: broadcast, test one bit per lane, blend in the sign. */
+__attribute__((target("avx2"))) static void
+spread_avx2(const uint8_t *in, Py_ssize_t n, uint8_t *out, uint16_t fill)
+{
+    const __m256i bit = _mm256_setr_epi16(
+        1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384,
+        (short)0x8000);
+    const __m256i base = _mm256_set1_epi16((short)fill);
+    const __m256i sign = _mm256_set1_epi16((short)SIGN_BIT);
+    Py_ssize_t i = 0;
+
+    for (; i + 2 <= n; i += 2) {
+        __m256i word = _mm256_set1_epi16((short)(in[i] | (in[i + 1] << 8)));
+        __m256i set = _mm256_cmpeq_epi16(_mm256_and_si256(word, bit), bit);
+        __m256i v = _mm256_or_si256(base, _mm256_and_si256(set, sign));
+        _mm256_storeu_si256((__m256i *)(out + 16 * i), v);
+    }
+    spread_swar(in + i, n - i, out + 16 * i, fill);
+}
+
+/* Four bytes per step: the input bits are the lane mask, as is. */
+__attribute__((target("avx512f,avx512bw"))) static void
+spread_avx512(const uint8_t *in, Py_ssize_t n, uint8_t *out, uint16_t fill)
+{
+    const __m512i clear = _mm512_set1_epi16((short)fill);
+    const __m512i set = _mm512_set1_epi16((short)(fill | SIGN_BIT));
+    Py_ssize_t i = 0;
+
+    for (; i + 4 <= n; i += 4) {
+        uint32_t k;
+        memcpy(&k, in + i, 4);
+        _mm512_storeu_si512(out + 16 * i,
+                            _mm512_mask_mov_epi16(clear, (__mmask32)k, set));
+    }
+    spread_swar(in + i, n - i, out + 16 * i, fill);
+}
+#endif
+
+#if defined(__ARM_FEATURE_SVE) && !defined(__ARM_BIG_ENDIAN)
+#include <arm_sve.h>
+#define SPREAD_NATIVE spread_sve
+#define SPREAD_NATIVE_NAME "sve"
+
+/*
+ * Vector-length agnostic: load a byte per lane, replicate byte l / 8 into
+ * lane l with a table lookup, and let a predicate pick fill or fill | sign.
+ */
+static void
+spread_sve(const uint8_t *in, Py_ssize_t n, uint8_t *out, uint16_t fill)
+{
+    const svbool_t all = svptrue_b16();
+    const svuint16_t lane = svindex_u16(0, 1);
+    const svuint16_t which = svlsr_n_u16_x(all, lane, 3);
+    const svuint16_t bit =
+        svlsl_u16_x(all, svdup_n_u16(1), svand_n_u16_x(all, lane, 7));
+    const svuint16_t clear = svdup_n_u16(fill);
+    const svuint16_t set = svdup_n_u16(fill | SIGN_BIT);
+    const int64_t step = (int64_t)svcnth() / 8;
+
+    for (int64_t i = 0; i < n; i += step) {
+        svuint16_t bytes = svld1ub_u16(svwhilelt_b16_s64(i, n), in + i);
+        svuint16_t rep = svtbl_u16(bytes, which);
+        svbool_t on = svcmpne_n_u16(all, svand_u16_x(all, rep, bit), 0);
+        svst1_u16(svwhilelt_b16_s64(i * 8, (int64_t)n * 8),
+                  (uint16_t *)(out + 16 * i), svsel_u16(on, set, clear));
+    }
+}
+#elif defined(__ARM_NEON) && !defined(__ARM_BIG_ENDIAN)
+#include <arm_neon.h>
+#define SPREAD_NATIVE spread_neon
+#define SPREAD_NATIVE_NAME "neon"
+
+/* One byte per step: broadcast, test one bit per lane, blend in the sign. */
+static void
+spread_neon(const uint8_t *in, Py_ssize_t n, uint8_t *out, uint16_t fill)
+{
+    static const uint16_t bits[8] = {1, 2, 4, 8, 16, 32, 64, 128};
+    const uint16x8_t bit = vld1q_u16(bits);
+    const uint16x8_t base = vdupq_n_u16(fill);
+    const uint16x8_t sign = vdupq_n_u16(SIGN_BIT);
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        uint16x8_t on = vtstq_u16(vdupq_n_u16(in[i]), bit);
+        vst1q_u16((uint16_t *)(out + 16 * i),
+                  vorrq_u16(base, vandq_u16(on, sign)));
+    }
+}
+#endif
+
+/*
+ * Every kernel this CPU can run, slowest first, so the last one is the one
+ * to use. Filled in once at import. On x86 that is from what this CPU
+ * actually supports; on ARM, NEON is always there and SVE is used when
+ * compiled in. All of them stay reachable through _spread_with for testing.
+ */
+typedef struct {
+    const char *name;
+    spread_fn fn;
+} spread_kernel;
+
+static spread_kernel spread_kernels[3];
+static int n_spread_kernels;
+static spread_fn spread_bits = spread_swar;
+
+static void
+add_spread_kernel(const char *name, spread_fn fn)
+{
+    spread_kernels[n_spread_kernels].name = name;
+    spread_kernels[n_spread_kernels].fn = fn;
+    n_spread_kernels++;
+    spread_bits = fn;
+}
+
+static PyObject *
+spread_impl(spread_fn fn, Py_buffer *buf, uint16_t fill)
+{
+    PyObject *result = PyBytes_FromStringAndSize(NULL, buf->len * 16);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    uint8_t *out = (uint8_t *)PyBytes_AS_STRING(result);
+    Py_BEGIN_ALLOW_THREADS
+    fn((const uint8_t *)buf->buf, buf->len, out, fill);
+    Py_END_ALLOW_THREADS
+
+    return result;
+}
+
+static PyObject *
+spread(PyObject *self, PyObject *args)
+{
+    Py_buffer buf;
+    unsigned short fill;
+    if (!PyArg_ParseTuple(args, "y*H", &buf, &fill)) {
+        return NULL;
+    }
+
+    PyObject *result = spread_impl(spread_bits, &buf, fill);
+    PyBuffer_Release(&buf);
+    return result;
+}
+
+static PyObject *
+spread_with(PyObject *self, PyObject *args)
+{
+    const char *kind;
+    Py_buffer buf;
+    unsigned short fill;
+    if (!PyArg_ParseTuple(args, "sy*H", &kind, &buf, &fill)) {
+        return NULL;
+    }
+
+    PyObject *result = NULL;
+    for (int i = 0; i < n_spread_kernels; i++) {
+        if (strcmp(kind, spread_kernels[i].name) == 0) {
+            result = spread_impl(spread_kernels[i].fn, &buf, fill);
+            PyBuffer_Release(&buf);
+            return result;
+        }
+    }
+
+    PyBuffer_Release(&buf);
+    PyErr_Format(PyExc_ValueError, "No %s kernel on this machine", kind);
+    return NULL;
+}
+
+static PyObject *
+pack_impl(PyObject *args, int width, uint16_t fill)
+{
+    Py_buffer head, buf;
+    if (!PyArg_ParseTuple(args, "y*y*", &head, &buf)) {
+        return NULL;
+    }
+
+    Py_ssize_t n_out = ((head.len + buf.len) * 8 + width - 1) / width;
+    PyObject *result = PyBytes_FromStringAndSize(NULL, n_out * 2);
+    if (result == NULL) {
+        PyBuffer_Release(&head);
+        PyBuffer_Release(&buf);
+        return NULL;
+    }
+
+    packer p = {(uint8_t *)PyBytes_AS_STRING(result), 0, 0, width, fill};
+    Py_BEGIN_ALLOW_THREADS
+    pack_span(&p, (const uint8_t *)head.buf, head.len);
+    pack_span(&p, (const uint8_t *)buf.buf, buf.len);
+    pack_flush(&p);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&head);
+    PyBuffer_Release(&buf);
+    return result;
+}
+
+static PyObject *
+unpack_impl(PyObject *args, int width)
+{
+    Py_buffer buf;
+    if (!PyArg_ParseTuple(args, "y*", &buf)) {
+        return NULL;
+    }
+    if (buf.len % 2 != 0) {
+        PyBuffer_Release(&buf);
+        PyErr_SetString(PyExc_ValueError, "Odd number of bytes in fp16 array");
+        return NULL;
+    }
+
+    Py_ssize_t n = buf.len / 2;
+    PyObject *result = PyBytes_FromStringAndSize(NULL, (n * width + 7) / 8);
+    if (result == NULL) {
+        PyBuffer_Release(&buf);
+        return NULL;
+    }
+
+    uint8_t *out = (uint8_t *)PyBytes_AS_STRING(result);
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = unpack_bits((const uint8_t *)buf.buf, n, out, width);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&buf);
+
+    if (status != OK) {
+        Py_DECREF(result);
+        PyErr_SetString(PyExc_ValueError,
+                        status == NOT_NAN ? "A number is pretending to be NaN"
+                        : status == NOT_SUBNORMAL ? "These aren't subnormal at all"
+                        : "Wrong kind of small");
+        return NULL;
+    }
+    return result;
+}
+
+static PyObject *
+pack9(PyObject *self, PyObject *args)
+{
+    return pack_impl(args, 9, NAN_QUIET);
+}
+
+static PyObject *
+unpack9(PyObject *self, PyObject *args)
+{
+    return unpack_impl(args, 9);
+}
+
+static PyObject *
+pack10(PyObject *self, PyObject *args)
+{
+    return pack_impl(args, 10, 0);
+}
+
+static PyObject *
+unpack10(PyObject *self, PyObject *args)
+{
+    return unpack_impl(args, 10);
+}
+
+static PyMethodDef methods[] = {
+    {"spread", spread, METH_VARARGS,
+     "spread(data, fill) -> bytes\n\nGive every bit its own fp16 value: fill, "
+     "with the sign bit set if the bit is."},
+    {"_spread_with", spread_with, METH_VARARGS,
+     "_spread_with(kind, data, fill) -> bytes\n\nspread() through the named "
+     "kernel, for testing. Raises ValueError if this CPU can't run it."},
+    {"pack9", pack9, METH_VARARGS,
+     "pack9(head, data) -> bytes\n\nPack head then data into quiet NaN "
+     "payloads."},
+    {"unpack9", unpack9, METH_VARARGS,
+     "unpack9(data) -> bytes\n\nValidate NaNs and concatenate their payloads."},
+    {"pack10", pack10, METH_VARARGS,
+     "pack10(head, data) -> bytes\n\nPack head then data into subnormal "
+     "mantissas."},
+    {"unpack10", unpack10, METH_VARARGS,
+     "unpack10(data) -> bytes\n\nValidate subnormals and concatenate their "
+     "mantissas."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    "notanumber._ext",
+    "Compiled kernels for notanumber.",
+    -1,
+    methods,
+};
+
+PyMODINIT_FUNC
+PyInit__ext(void)
+{
+    n_spread_kernels = 0;
+    add_spread_kernel("swar", spread_swar);
+#ifdef SPREAD_NATIVE
+    add_spread_kernel(SPREAD_NATIVE_NAME, SPREAD_NATIVE);
+#endif
+#ifdef HAVE_X86_DISPATCH
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) {
+        add_spread_kernel("avx2", spread_avx2);
+    }
+    if (__builtin_cpu_supports("avx512bw")) {
+        add_spread_kernel("avx512", spread_avx512);
+    }
+#endif
+
+    PyObject *m = PyModule_Create(&module);
+    if (m == NULL) {
+        return NULL;
+    }
+
+    PyObject *names = PyTuple_New(n_spread_kernels);
+    if (names == NULL) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    for (int i = 0; i < n_spread_kernels; i++) {
+        PyObject *name = PyUnicode_FromString(spread_kernels[i].name);
+        if (name == NULL) {
+            Py_DECREF(names);
+            Py_DECREF(m);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(names, i, name);
+    }
+    if (PyModule_AddObject(m, "_SPREAD_KERNELS", names) < 0) {
+        Py_DECREF(names);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
@@ -0,0 +1,10 @@
+from collections.abc import Buffer
+
+_SPREAD_KERNELS: tuple[str, ...]
+
+def spread(data: Buffer, fill: int, /) -> bytes: ...
+def _spread_with(kind: str, data: Buffer, fill: int, /) -> bytes: ...
+def pack9(head: Buffer, data: Buffer, /) -> bytes: ...
+def unpack9(data: Buffer, /) -> bytes: ...
+def pack10(head: Buffer, data: Buffer, /) -> bytes: ...
+def unpack10(data: Buffer, /) -> bytes: ...
@@ -0,0 +1,97 @@
+"""
+Numba kernels for the 9- and 10-bit codecs.
+
+Importing this module raises ImportError when Numba is not installed,
+in which case core quietly carries on with NumPy or pure Python.
+
+Both kernels stream through a rolling integer accumulator, the same way
+the C extension does: bytes go in at the top, ``width``-bit chunks come
+out at the bottom (or the other way around), with no per-bit work.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, boundscheck=False, inline="always")
+def _pack_span(
+    buf: np.ndarray,
+    out: np.ndarray,
+    k: int,
+    acc: int,
+    nbits: int,
+    width: int,
+    fill: int,
+) -> tuple[int, int, int]:
+    """Feed ``buf`` into the accumulator, draining full chunks into ``out``."""
+    mask = (1 << width) - 1
+    for i in range(buf.size):
+        acc |= int(buf[i]) << nbits
+        nbits += 8
+        if nbits >= width:
+            out[k] = fill | (acc & mask)
+            k += 1
+            acc >>= width
+            nbits -= width
+    return k, acc, nbits
+
+
+@njit(cache=True, boundscheck=False)
+def pack_bits(
+    head: np.ndarray, buf: np.ndarray, out: np.ndarray, width: int, fill: int
+) -> None:
+    """Slice ``head`` then ``buf`` into ``width``-bit chunks, OR each with ``fill``.
+
+    The two inputs are read as one stream without being joined. The last
+    chunk is zero-padded.
+
+    Args:
+        head (np.ndarray): uint8 bytes to pack first.
+        buf (np.ndarray): uint8 input bytes.
+        out (np.ndarray): uint16 output, one value per chunk, preallocated.
+        width (int): Bits per chunk, at least 8.
+        fill (int): Bits to set on every output value.
+    """
+    k, acc, nbits = _pack_span(head, out, 0, 0, 0, width, fill)
+    k, acc, nbits = _pack_span(buf, out, k, acc, nbits, width, fill)
+    if nbits > 0:
+        out[k] = fill | acc
+
+
+@njit(cache=True, boundscheck=False)
+def unpack_bits(
+    vals: np.ndarray, out: np.ndarray, width: int, flip: int, check: int
+) -> int:
+    """Validate values and concatenate their low ``width`` bits into ``out``.
+
+    Validation and extraction share one pass over ``vals``.
+
+    Args:
+        vals (np.ndarray): Raw uint16 values.
+        out (np.ndarray): uint8 output of ``ceil(vals.size * width / 8)``
+            bytes, preallocated.
+        width (int): Bits per payload.
+        flip (int): Bits every value must have set.
+        check (int): Bits to validate; all other bits of ``check`` must be clear.
+
+    Returns:
+        int: The OR of ``(v ^ flip) & check`` over every value.
+    """
+    mask = (1 << width) - 1
+    acc = 0
+    nbits = 0
+    j = 0
+    bad = 0
+    for k in range(vals.size):
+        val = int(vals[k])
+        bad |= (val ^ flip) & check
+        acc |= (val & mask) << nbits
+        nbits += width
+        while nbits >= 8:
+            out[j] = acc & 0xFF
+            j += 1
+            acc >>= 8
+            nbits -= 8
+    if nbits > 0:
+        out[j] = acc
+    return bad
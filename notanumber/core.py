@@ -13,8 +13,25 @@ We offer four delightful flavors:
 There is no life I know to compare with pure imagination.
 """
 
+import array
 import struct
-from typing import Literal
+import sys
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
+
+try:
+    import numpy as np
+except ImportError:  # Pure imagination only, then.
+    np = None  # type: ignore[assignment]
+
+try:
+    from . import _ext
+except ImportError:
+    _ext = None  # type: ignore[assignment]
+
+# Numba takes longer to import than everything else put together, so it is
+# only loaded once a kernel is actually wanted; False means not tried yet
+_jit: Any = False
 
 # IEEE 754 fp16 bit patterns
 SIGN_BIT = 0x8000
@@ -27,6 +44,208 @@ PAYLOAD_MASK = 0x01FF
 # Safety limit: 100MB input
 MAX_INPUT_SIZE = 100 * 1024 * 1024
 
+# Formats compiled once, not re-parsed on every call in the scalar loops
+_PACK_U32 = struct.Struct("<I").pack
+_UNPACK_U32_FROM = struct.Struct("<I").unpack_from
+
+
+def _to_le16(vals: "np.ndarray") -> bytes:
+    """Serialize a uint16 array as little-endian fp16 bytes, whatever the host."""
+    return vals.astype("<u2", copy=False).tobytes()
+
+
+def _le16_values(data: bytes | memoryview) -> "array.array[int]":
+    """Parse little-endian fp16 bytes into plain ints, all at once, in C."""
+    vals = array.array("H")
+    vals.frombytes(data)
+    if sys.byteorder != "little":
+        vals.byteswap()
+    return vals
+
+
+def _le16_bytes(vals: "array.array[int]") -> bytes:
+    """Serialize plain ints as little-endian fp16 bytes, the inverse of the above."""
+    if sys.byteorder != "little":
+        vals.byteswap()
+    return vals.tobytes()
+
+
+def _build_lut(fill: int) -> "np.ndarray":
+    """Tabulate the 16 output bytes for each of the 256 possible input bytes.
+
+    Row ``b`` holds eight fp16 values, ``fill`` plus the sign bit wherever
+    bit ``j`` of ``b`` is set.
+    """
+    rows = np.arange(256, dtype=np.uint8)[:, None]
+    bits = np.unpackbits(rows, axis=1, bitorder="little").astype("<u2")
+    return ((bits << 15) | fill).astype("<u2").view(np.uint8)
+
+
+# One gather per input byte instead of eight bit tests
+_ZERO_LUT = _build_lut(0) if np is not None else None
+_INF_LUT = _build_lut(INF_BITS) if np is not None else None
+
+
+def _build_rows(fill: int) -> tuple[bytes, ...]:
+    """The same table without NumPy: the 16 output bytes for each input byte."""
+    return tuple(
+        struct.pack(
+            "<8H", *[fill | (SIGN_BIT if b & (1 << j) else 0) for j in range(8)]
+        )
+        for b in range(256)
+    )
+
+
+# Every possible byte, already spread out; encoding is just picking rows
+_ZERO_ROWS = _build_rows(0)
+_INF_ROWS = _build_rows(INF_BITS)
+
+
+def _load_jit() -> Any:
+    """Import the Numba kernels on first use, or settle for None."""
+    global _jit
+    if _jit is False:
+        try:
+            from . import _jit as jit
+        except ImportError:
+            jit = None  # type: ignore[assignment]
+        _jit = jit
+    return _jit
+
+
+def _pack_bits(head: bytes, data: bytes, width: int, fill: int = 0) -> "np.ndarray":
+    """Slice ``head`` then ``data`` into little-endian chunks of ``width`` bits.
+
+    The two are packed as one stream without being joined. The last chunk
+    is zero-padded, matching the pure-Python loops. Every chunk is ORed
+    with ``fill``.
+    """
+    n = ((len(head) + len(data)) * 8 + width - 1) // width
+    head_arr = np.frombuffer(head, dtype=np.uint8)
+    data_arr = np.frombuffer(data, dtype=np.uint8)
+
+    jit = _load_jit()
+    if jit is not None:
+        out = np.empty(n, dtype=np.uint16)
+        jit.pack_bits(head_arr, data_arr, out, width, fill)
+        return out
+
+    split = head_arr.size * 8
+    end = split + data_arr.size * 8
+    bits = np.empty(n * width, dtype=np.uint8)
+    bits[:split] = np.unpackbits(head_arr, bitorder="little")
+    bits[split:end] = np.unpackbits(data_arr, bitorder="little")
+    bits[end:] = 0
+    weights = 1 << np.arange(width, dtype="<u2")
+    return (bits.reshape(n, width) @ weights) | fill
+
+
+# Values per tile when validating and unpacking, so both passes over a tile
+# run while it is still in cache (64 KiB of input)
+_TILE = 1 << 15
+
+
+def _unpack_bits(
+    vals: "np.ndarray", width: int, flip: int, check: int
+) -> tuple[bytes, int]:
+    """Validate values and concatenate their low ``width`` bits into bytes.
+
+    Args:
+        vals (np.ndarray): Raw uint16 values.
+        width (int): Payload bits per value.
+        flip (int): Bits every value must have set.
+        check (int): Bits to validate; all other bits of ``check`` must be clear.
+
+    Returns:
+        tuple[bytes, int]: The payloads, and the OR of ``(v ^ flip) & check``
+            over every value. Anything nonzero means trouble.
+    """
+    jit = _load_jit()
+    if jit is not None:
+        out = np.empty((vals.size * width + 7) // 8, dtype=np.uint8)
+        bad = jit.unpack_bits(
+            vals.astype(np.uint16, copy=False), out, width, flip, check
+        )
+        return out.tobytes(), bad
+
+    pieces = []
+    bad = 0
+    for start in range(0, vals.size, _TILE):
+        tile = vals[start : start + _TILE]
+        if flip:
+            bad |= ~int(np.bitwise_and.reduce(tile)) & flip
+        bad |= int(np.bitwise_or.reduce(tile)) & check & ~flip
+        lanes = (tile & ((1 << width) - 1)).astype("<u2").view(np.uint8)
+        bits = np.unpackbits(lanes, bitorder="little").reshape(-1, 16)
+        pieces.append(np.packbits(bits[:, :width].reshape(-1), bitorder="little"))
+    return b"".join(pieces), bad
+
+
+def _unframe(
+    num_values: int,
+    width: int,
+    payloads: Callable[[int, int], bytes],
+    flavor: str,
+    step: int,
+) -> Iterator[bytes]:
+    """Read the 4-byte length header, then decode only the values it needs.
+
+    The first few values are decoded on their own to learn the length, so a
+    corrupted header fails fast and the bulk decode never overshoots. The
+    rest is decoded ``step`` values at a time; steps are kept to multiples of
+    eight values so every piece ends on a byte boundary. Values after the
+    last one the header needs are validated and thrown away.
+
+    Args:
+        num_values (int): How many fp16 values there are.
+        width (int): Payload bits per value.
+        payloads (Callable): Validates values ``[start, stop)`` and
+            concatenates their payloads.
+        flavor (str): What to call the data when complaining.
+        step (int): Values to decode per piece.
+
+    Returns:
+        Iterator[bytes]: The framed data, header removed, piece by piece.
+
+    Raises:
+        ValueError: If the header promises more than the data holds, or
+            ``payloads`` objects to any value, including trailing ones.
+    """
+    head = payloads(0, min((32 + width - 1) // width, num_values))
+    if len(head) < 4:
+        raise ValueError(f"Corrupted length header in {flavor} data")
+    length = _UNPACK_U32_FROM(head)[0]
+    needed = ((4 + length) * 8 + width - 1) // width
+    if needed > num_values:
+        raise ValueError(f"Corrupted length header in {flavor} data")
+
+    step = max(8, step - step % 8)
+    skip = 4
+    remaining = length
+    for start in range(0, needed, step):
+        if not remaining:
+            break
+        piece = payloads(start, min(start + step, needed))[skip : skip + remaining]
+        skip = 0
+        remaining -= len(piece)
+        yield piece
+
+    # Anything past the declared length carries no data, but it still has to
+    # be the right kind of number; encode() never writes any, so this is free
+    for start in range(needed, num_values, step):
+        payloads(start, min(start + step, num_values))
+
+
+def _zero_values(data: bytes) -> bytes:
+    """Spread bits across the signs of zeros, no questions asked."""
+    if _ext is not None:
+        return _ext.spread(data, 0)
+
+    if np is not None:
+        return _ZERO_LUT[np.frombuffer(data, dtype=np.uint8)].tobytes()
+
+    return b"".join(map(_ZERO_ROWS.__getitem__, data))
+
 
 def to_zero(data: bytes) -> bytes:
     """Store data in the sign bits of zeros.
@@ -46,16 +265,23 @@ def to_zero(data: bytes) -> bytes:
     if len(data) > MAX_INPUT_SIZE:
         raise ValueError(f"Data too large: {len(data)} bytes (max {MAX_INPUT_SIZE})")
 
-    ret = bytearray()
+    return _zero_values(data)
 
-    for byte in data:
-        for bit_idx in range(8):
-            if byte & (1 << bit_idx):
-                ret.extend(struct.pack("<H", SIGN_BIT))  # -0.0
-            else:
-                ret.extend(struct.pack("<H", 0))  # +0.0
 
-    return bytes(ret)
+def _check_whole_bytes(num_values: int) -> None:
+    """Sign-bit flavors spend exactly eight values on every byte."""
+    if num_values % 8 != 0:
+        raise ValueError(f"Array length {num_values} not divisible by 8")
+
+
+def _from_zero_arr(vals: "np.ndarray") -> bytes:
+    """Decode zeros already viewed as a little-endian uint16 array."""
+    _check_whole_bytes(vals.size)
+    # One OR-reduction over everything; anything but a sign bit is trouble
+    if np.bitwise_or.reduce(vals) & (EXPONENT_MASK | MANTISSA_MASK):
+        raise ValueError("Impure zeros detected")
+    signs = (vals >> 15).astype(np.uint8)
+    return np.packbits(signs, bitorder="little").tobytes()
 
 
 def from_zero(data: bytes) -> bytes:
@@ -75,25 +301,41 @@ def from_zero(data: bytes) -> bytes:
     if len(data) % 2 != 0:
         raise ValueError("Odd number of bytes in fp16 array")
 
+    if np is not None:
+        return _from_zero_arr(np.frombuffer(data, dtype="<u2"))
+
     num_values = len(data) // 2
-    if num_values % 8 != 0:
-        raise ValueError(f"Array length {num_values} not divisible by 8")
+    _check_whole_bytes(num_values)
 
-    ret = bytearray()
+    vals = _le16_values(data)
+    ret = bytearray(num_values // 8)
+    bad = 0
 
     for i in range(0, num_values, 8):
         byte = 0
         for j in range(8):
-            val = struct.unpack("<H", data[(i + j) * 2 : (i + j + 1) * 2])[0]
-            if val == SIGN_BIT:
-                byte |= 1 << j
-            elif val != 0:
-                raise ValueError("Impure zeros detected")
-        ret.append(byte)
+            val = vals[i + j]
+            bad |= val
+            byte |= (val >> 15) << j
+        ret[i // 8] = byte
+
+    if bad & (EXPONENT_MASK | MANTISSA_MASK):
+        raise ValueError("Impure zeros detected")
 
     return bytes(ret)
 
 
+def _inf_values(data: bytes) -> bytes:
+    """Spread bits across the signs of infinities, no questions asked."""
+    if _ext is not None:
+        return _ext.spread(data, INF_BITS)
+
+    if np is not None:
+        return _INF_LUT[np.frombuffer(data, dtype=np.uint8)].tobytes()
+
+    return b"".join(map(_INF_ROWS.__getitem__, data))
+
+
 def to_inf(data: bytes) -> bytes:
     """Store data in the signs of infinities.
 
@@ -111,16 +353,20 @@ def to_inf(data: bytes) -> bytes:
     if len(data) > MAX_INPUT_SIZE:
         raise ValueError(f"Data too large: {len(data)} bytes (max {MAX_INPUT_SIZE})")
 
-    ret = bytearray()
+    return _inf_values(data)
 
-    for byte in data:
-        for bit_idx in range(8):
-            if byte & (1 << bit_idx):
-                ret.extend(struct.pack("<H", INF_BITS | SIGN_BIT))  # -inf
-            else:
-                ret.extend(struct.pack("<H", INF_BITS))  # +inf
 
-    return bytes(ret)
+def _from_inf_arr(vals: "np.ndarray") -> bytes:
+    """Decode infinities already viewed as a little-endian uint16 array."""
+    _check_whole_bytes(vals.size)
+    # Any bit that differs from +inf, other than the sign, is trouble
+    bad = np.bitwise_or.reduce(vals ^ INF_BITS)
+    if bad & EXPONENT_MASK:
+        raise ValueError("Non-infinity found in the infinity room")
+    if bad & MANTISSA_MASK:
+        raise ValueError("A NaN snuck into our infinities")
+    signs = ((vals >> 15) & 1).astype(np.uint8)
+    return np.packbits(signs, bitorder="little").tobytes()
 
 
 def from_inf(data: bytes) -> bytes:
@@ -140,27 +386,86 @@ def from_inf(data: bytes) -> bytes:
     if len(data) % 2 != 0:
         raise ValueError("Odd number of bytes in fp16 array")
 
+    if np is not None:
+        return _from_inf_arr(np.frombuffer(data, dtype="<u2"))
+
     num_values = len(data) // 2
-    if num_values % 8 != 0:
-        raise ValueError(f"Array length {num_values} not divisible by 8")
+    _check_whole_bytes(num_values)
 
-    ret = bytearray()
+    vals = _le16_values(data)
+    ret = bytearray(num_values // 8)
+    bad = 0
 
     for i in range(0, num_values, 8):
         byte = 0
         for j in range(8):
-            val = struct.unpack("<H", data[(i + j) * 2 : (i + j + 1) * 2])[0]
-            if (val & EXPONENT_MASK) != INF_BITS:
-                raise ValueError("Non-infinity found in the infinity room")
-            if (val & MANTISSA_MASK) != 0:
-                raise ValueError("A NaN snuck into our infinities")
-            if val & SIGN_BIT:
-                byte |= 1 << j
-        ret.append(byte)
+            val = vals[i + j]
+            bad |= val ^ INF_BITS
+            byte |= (val >> 15) << j
+        ret[i // 8] = byte
+
+    if bad & EXPONENT_MASK:
+        raise ValueError("Non-infinity found in the infinity room")
+    if bad & MANTISSA_MASK:
+        raise ValueError("A NaN snuck into our infinities")
 
     return bytes(ret)
 
 
+# Values per block when packing without NumPy, so the list of ints built for
+# one block stays small before it is folded into the output array
+_PACK_BLOCK = 1 << 15
+
+
+def _pack_windows(head: bytes, data: bytes, width: int, fill: int = 0) -> bytes:
+    """Pack ``head`` then ``data`` into ``width``-bit values without NumPy.
+
+    Each value is shifted out of one four-byte window read in place with
+    unpack_from. Windows that straddle the header or run off the end read
+    from small copies of just those bytes (the end padded with zeros);
+    everything else is read straight from ``data``, so the payload itself
+    is never copied.
+    """
+    mask = (1 << width) - 1
+
+    def windows(src: bytes, start: int, stop: int) -> list[int]:
+        return [
+            fill | (_UNPACK_U32_FROM(src, p >> 3)[0] >> (p & 7)) & mask
+            for p in range(start, stop, width)
+        ]
+
+    head_bits = len(head) * 8
+    total_bits = head_bits + len(data) * 8
+    if len(data) < 6:
+        stream = head + bytes(data) + b"\x00\x00\x00"
+        return _le16_bytes(array.array("H", windows(stream, 0, total_bits)))
+
+    # First value starting past the header, and first starting in the last
+    # three bytes; the windows in between lie wholly inside ``data``
+    mid = -(-head_bits // width) * width
+    end_bits = total_bits - 24
+    end = -(-end_bits // width) * width
+
+    vals = array.array("H", windows(head + bytes(data[:3]), 0, mid))
+    step = _PACK_BLOCK * width
+    for start in range(mid - head_bits, end - head_bits, step):
+        vals.fromlist(windows(data, start, min(start + step, end - head_bits)))
+    tail = bytes(data[-3:]) + b"\x00\x00\x00"
+    vals.fromlist(windows(tail, end - end_bits, total_bits - end_bits))
+    return _le16_bytes(vals)
+
+
+def _nan_values(data: bytes, head: bytes = b"") -> bytes:
+    """Pack ``head`` then ``data`` into NaN payloads, nine bits apiece."""
+    if _ext is not None:
+        return _ext.pack9(head, data)
+
+    if np is not None:
+        return _to_le16(_pack_bits(head, data, 9, NAN_QUIET))
+
+    return _pack_windows(head, data, 9, NAN_QUIET)
+
+
 def to_nan(data: bytes) -> bytes:
     """Store data in NaN payloads.
 
@@ -179,27 +484,57 @@ def to_nan(data: bytes) -> bytes:
     if len(data) > MAX_INPUT_SIZE:
         raise ValueError(f"Data too large: {len(data)} bytes (max {MAX_INPUT_SIZE})")
 
-    # Encode the length first (4 bytes, little-endian)
-    data_with_length = struct.pack("<I", len(data)) + data
+    # The length goes first (4 bytes, little-endian), packed in front of the
+    # data rather than glued onto a copy of it
+    return _nan_values(data, _PACK_U32(len(data)))
 
-    ret = bytearray()
 
-    # Process all bytes and pack into 9-bit chunks
-    for i in range(0, len(data_with_length) * 8, 9):
-        # Collect up to 9 bits
-        bits = 0
-        for j in range(9):
-            byte_idx = (i + j) // 8
-            bit_idx = (i + j) % 8
-            if byte_idx < len(data_with_length):
-                if data_with_length[byte_idx] & (1 << bit_idx):
-                    bits |= 1 << j
+def _nan_payloads_arr(vals: "np.ndarray") -> bytes:
+    """Validate NaNs and concatenate their 9-bit payloads, header and all."""
+    if _ext is not None:
+        return _ext.unpack9(vals)
+    # Every value must have all of the quiet NaN bits set
+    result, bad = _unpack_bits(vals, 9, NAN_QUIET, NAN_QUIET)
+    if bad:
+        raise ValueError("A number is pretending to be NaN")
+    return result
 
-        # Create NaN with payload
-        nan_bits = NAN_QUIET | bits
-        ret.extend(struct.pack("<H", nan_bits))
 
-    return bytes(ret)
+def _from_nan_arr(vals: "np.ndarray") -> bytes:
+    """Decode NaNs already viewed as a little-endian uint16 array."""
+    pieces = _unframe(
+        vals.size, 9, lambda a, b: _nan_payloads_arr(vals[a:b]), "NaN", vals.size
+    )
+    return b"".join(pieces)
+
+
+def _nan_payloads(view: memoryview) -> bytes:
+    """Validate NaNs and concatenate their 9-bit payloads, header and all."""
+    if _ext is not None:
+        return _ext.unpack9(view)
+
+    # Payloads roll into an accumulator that spills a byte at a time
+    result = bytearray()
+    append = result.append
+    acc = 0
+    nbits = 0
+    bad = 0
+    for val in _le16_values(view):
+        bad |= ~val & NAN_QUIET
+        acc |= (val & PAYLOAD_MASK) << nbits
+        nbits += 9
+        while nbits >= 8:
+            append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+
+    if nbits:
+        append(acc)
+
+    if bad:
+        raise ValueError("A number is pretending to be NaN")
+
+    return bytes(result)
 
 
 def from_nan(data: bytes) -> bytes:
@@ -219,36 +554,31 @@ def from_nan(data: bytes) -> bytes:
     if len(data) % 2 != 0:
         raise ValueError("Odd number of bytes in fp16 array")
 
-    # Extract all 9-bit payloads
-    total_bits = (len(data) // 2) * 9
-    result = bytearray((total_bits + 7) // 8)
+    if np is not None:
+        return _from_nan_arr(np.frombuffer(data, dtype="<u2"))
 
-    bit_pos = 0
-    for i in range(0, len(data), 2):
-        val = struct.unpack("<H", data[i : i + 2])[0]
-        if (val & 0x7E00) != 0x7E00:
-            raise ValueError("A number is pretending to be NaN")
+    view = memoryview(data)
+    num_values = len(view) // 2
+    pieces = _unframe(
+        num_values,
+        9,
+        lambda a, b: _nan_payloads(view[a * 2 : b * 2]),
+        "NaN",
+        num_values,
+    )
+    return b"".join(pieces)
 
-        payload = val & PAYLOAD_MASK
 
-        # Unpack 9 bits
-        for j in range(9):
-            if bit_pos < total_bits:
-                byte_idx = bit_pos // 8
-                bit_idx = bit_pos % 8
-                if payload & (1 << j):
-                    result[byte_idx] |= 1 << bit_idx
-                bit_pos += 1
+def _subnormal_values(data: bytes, head: bytes = b"") -> bytes:
+    """Pack ``head`` then ``data`` into subnormal mantissas, ten bits apiece."""
+    if _ext is not None:
+        return _ext.pack10(head, data)
 
-    # Extract length and trim
-    if len(result) >= 4:
-        length = struct.unpack("<I", bytes(result[:4]))[0]
-        if length == 0:
-            return b""
-        if 4 + length <= len(result):
-            return bytes(result[4 : 4 + length])
+    if np is not None:
+        return _to_le16(_pack_bits(head, data, 10))
 
-    raise ValueError("Corrupted length header in NaN data")
+    # We use all mantissa values 0-1023 (including zero!)
+    return _pack_windows(head, data, 10)
 
 
 def to_subnormal(data: bytes) -> bytes:
@@ -272,28 +602,65 @@ def to_subnormal(data: bytes) -> bytes:
     if len(data) > MAX_INPUT_SIZE:
         raise ValueError(f"Data too large: {len(data)} bytes (max {MAX_INPUT_SIZE})")
 
-    # Encode the length first
-    data_with_length = struct.pack("<I", len(data)) + data
-
-    ret = bytearray()
-
-    # Process all bytes and pack into 10-bit chunks
-    # We use all mantissa values 0-1023 (including zero!)
-    total_bits = len(data_with_length) * 8
-    for i in range(0, total_bits, 10):
-        # Collect up to 10 bits
-        bits = 0
-        for j in range(10):
-            if i + j < total_bits:
-                byte_idx = (i + j) // 8
-                bit_idx = (i + j) % 8
-                if data_with_length[byte_idx] & (1 << bit_idx):
-                    bits |= 1 << j
-
-        # Store directly - mantissa can be 0-1023
-        ret.extend(struct.pack("<H", bits))
-
-    return bytes(ret)
+    # Encode the length first, without copying the data to make room for it
+    return _subnormal_values(data, _PACK_U32(len(data)))
+
+
+def _subnormal_payloads_arr(vals: "np.ndarray") -> bytes:
+    """Validate subnormals and concatenate their 10-bit mantissas."""
+    if _ext is not None:
+        return _ext.unpack10(vals)
+    # Mantissa bits only, please
+    result, bad = _unpack_bits(vals, 10, 0, EXPONENT_MASK | SIGN_BIT)
+    if bad & EXPONENT_MASK:
+        raise ValueError("These aren't subnormal at all")
+    if bad & SIGN_BIT:
+        raise ValueError("Wrong kind of small")
+    return result
+
+
+def _from_subnormal_arr(vals: "np.ndarray") -> bytes:
+    """Decode subnormals already viewed as a little-endian uint16 array."""
+    pieces = _unframe(
+        vals.size,
+        10,
+        lambda a, b: _subnormal_payloads_arr(vals[a:b]),
+        "subnormal",
+        vals.size,
+    )
+    return b"".join(pieces)
+
+
+def _subnormal_payloads(view: memoryview) -> bytes:
+    """Validate subnormals and concatenate their 10-bit mantissas."""
+    if _ext is not None:
+        return _ext.unpack10(view)
+
+    # Same rolling accumulator as for NaNs, ten bits in per value
+    result = bytearray()
+    append = result.append
+    acc = 0
+    nbits = 0
+    bad = 0
+    for val in _le16_values(view):
+        # Collect anything that isn't a valid subnormal or zero
+        bad |= val
+        acc |= (val & MANTISSA_MASK) << nbits
+        nbits += 10
+        while nbits >= 8:
+            append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+
+    if nbits:
+        append(acc)
+
+    if bad & EXPONENT_MASK:
+        raise ValueError("These aren't subnormal at all")
+    if bad & SIGN_BIT:
+        raise ValueError("Wrong kind of small")
+
+    return bytes(result)
 
 
 def from_subnormal(data: bytes) -> bytes:
@@ -313,42 +680,85 @@ def from_subnormal(data: bytes) -> bytes:
     if len(data) % 2 != 0:
         raise ValueError("Odd number of bytes in fp16 array")
 
-    # Pre-allocate result based on number of values
-    num_values = len(data) // 2
-    total_bits = num_values * 10
-    result = bytearray((total_bits + 7) // 8)
-
-    bit_pos = 0
-    for i in range(0, len(data), 2):
-        val = struct.unpack("<H", data[i : i + 2])[0]
-
-        # Check it's a valid subnormal or zero
-        if (val & EXPONENT_MASK) != 0:
-            raise ValueError("These aren't subnormal at all")
-        if (val & SIGN_BIT) != 0:
-            raise ValueError("Wrong kind of small")
-
-        # Extract mantissa (0-1023)
-        mantissa = val & MANTISSA_MASK
-
-        # Unpack 10 bits
-        for j in range(10):
-            byte_idx = bit_pos // 8
-            bit_idx = bit_pos % 8
-            if byte_idx < len(result):
-                if mantissa & (1 << j):
-                    result[byte_idx] |= 1 << bit_idx
-            bit_pos += 1
-
-    # Extract length and trim
-    if len(result) >= 4:
-        length = struct.unpack("<I", bytes(result[:4]))[0]
-        if length == 0:
-            return b""
-        if 4 + length <= len(result):
-            return bytes(result[4 : 4 + length])
-
-    raise ValueError("Corrupted length header in subnormal data")
+    if np is not None:
+        return _from_subnormal_arr(np.frombuffer(data, dtype="<u2"))
+
+    view = memoryview(data)
+    num_values = len(view) // 2
+    pieces = _unframe(
+        num_values,
+        10,
+        lambda a, b: _subnormal_payloads(view[a * 2 : b * 2]),
+        "subnormal",
+        num_values,
+    )
+    return b"".join(pieces)
+
+
+def _encode_pieces(
+    view: memoryview,
+    values: Callable[..., bytes],
+    width: int | None,
+    chunk: int,
+) -> Iterator[bytes]:
+    """Feed ``view`` to an encoder in pieces that need no state between them."""
+    if width is None:
+        # One byte in, sixteen out, nothing carried over
+        step = max(1, chunk)
+        for start in range(0, len(view), step):
+            yield values(view[start : start + step])
+        return
+
+    # Eight payloads of ``width`` bits fill exactly ``width`` bytes, so pieces
+    # cut on those boundaries (counting the header) line up with no carry
+    step = max(width, chunk - chunk % width)
+    yield values(view[: step - 4], _PACK_U32(len(view)))
+    for start in range(step - 4, len(view), step):
+        yield values(view[start : start + step])
+
+
+def encode_iter(
+    data: bytes,
+    method: Literal["zero", "inf", "nan", "subnormal"] = "nan",
+    chunk: int = 1 << 20,
+) -> Iterator[bytes]:
+    """Encode data a piece at a time, for when it's too much to swallow whole.
+
+    The pieces joined together are exactly what encode() would return, but
+    only one piece needs to exist at a time. There is no size limit beyond
+    what a 4-byte length header can count. The input is only ever sliced,
+    so a memory-mapped file need never be read in all at once.
+
+    Args:
+        data (bytes): Your offering, however large; any bytes-like object.
+        method {'zero', 'inf', *'nan'*, 'subnormal'}: Your chosen door.
+        chunk (int): Roughly how many input bytes to encode per piece.
+
+    Returns:
+        Iterator[bytes]: Your data, transformed, a bite at a time.
+
+    Raises:
+        ValueError: If you ask for a door that doesn't exist, or bring more
+            than the length header can count.
+    """
+    methods = {
+        "zero": _zero_values,
+        "inf": _inf_values,
+        "nan": _nan_values,
+        "subnormal": _subnormal_values,
+    }
+    widths = {"nan": 9, "subnormal": 10}
+
+    if method not in methods:
+        raise ValueError(f"There is no {method} room")
+
+    # Count and slice in bytes, whatever the item size of the buffer
+    view = memoryview(data).cast("B")
+
+    if method in widths and len(view) > 0xFFFFFFFF:
+        raise ValueError(f"Data too large: {len(view)} bytes (max {0xFFFFFFFF})")
+
+    return _encode_pieces(view, methods[method], widths.get(method), chunk)
 
 
 def encode(
@@ -379,9 +789,116 @@ def encode(
     if method not in methods:
         raise ValueError(f"There is no {method} room")
 
+    # One shot, one buffer; encode_iter is for when that is too much
     return methods[method](data)
 
 
+def _detect(data: bytes | memoryview) -> Literal["zero", "inf", "nan", "subnormal"]:
+    """Guess which door the data came through from its first value."""
+    if len(data) < 2:
+        raise ValueError("I need more than crumbs to work with")
+
+    first = data[0] | (data[1] << 8)
+
+    if first == 0 or first == SIGN_BIT:
+        return "zero"
+    elif (first & EXPONENT_MASK) == INF_BITS and (first & MANTISSA_MASK) == 0:
+        return "inf"
+    elif (first & 0x7E00) == 0x7E00:
+        return "nan"
+    elif (first & EXPONENT_MASK) == 0:
+        return "subnormal"
+    else:
+        raise ValueError("This doesn't look like anything I've made")
+
+
+def _decode_pieces(view: memoryview, method: str, step: int) -> Iterator[bytes]:
+    """Decode ``step`` values at a time; ``step`` is a multiple of eight."""
+    methods: dict[str, Callable[[Any], bytes]]
+
+    if np is not None:
+        # Reinterpret the buffer once and slice views of it from here on
+        vals = np.frombuffer(view, dtype="<u2")
+        methods = {
+            "zero": _from_zero_arr,
+            "inf": _from_inf_arr,
+            "nan": _nan_payloads_arr,
+            "subnormal": _subnormal_payloads_arr,
+        }
+
+        def values(start: int, stop: int) -> Any:
+            return vals[start:stop]
+
+    else:
+        methods = {
+            "zero": from_zero,
+            "inf": from_inf,
+            "nan": _nan_payloads,
+            "subnormal": _subnormal_payloads,
+        }
+
+        def values(start: int, stop: int) -> Any:
+            return view[start * 2 : stop * 2]
+
+    decoder = methods[method]
+    num_values = len(view) // 2
+
+    if method == "nan":
+        framed = _unframe(
+            num_values, 9, lambda a, b: decoder(values(a, b)), "NaN", step
+        )
+        yield from framed
+    elif method == "subnormal":
+        framed = _unframe(
+            num_values, 10, lambda a, b: decoder(values(a, b)), "subnormal", step
+        )
+        yield from framed
+    else:
+        for start in range(0, num_values, step):
+            yield decoder(values(start, start + step))
+
+
+def decode_iter(
+    data: bytes,
+    method: Literal["zero", "inf", "nan", "subnormal", "auto"] = "auto",
+    chunk: int = 1 << 20,
+) -> Iterator[bytes]:
+    """Decode data a piece at a time.
+
+    The pieces joined together are exactly what decode() would return.
+    As with encode_iter(), a memory-mapped file works as well as bytes.
+
+    Args:
+        data (bytes): Disguised data; any bytes-like object.
+        method : {'zero', 'inf', 'nan', 'subnormal', *'auto'*}: Which door did
+            you use? I'll check if you forgot.
+        chunk (int): Roughly how many encoded bytes to decode per piece.
+
+    Returns:
+        Iterator[bytes]: Your data, returned to you a bite at a time.
+
+    Raises:
+        ValueError: If I can't tell which door you used.
+    """
+    # Count and slice in bytes, whatever the item size of the buffer
+    view = memoryview(data).cast("B")
+
+    if method == "auto":
+        method = _detect(view)
+
+    if method not in ("zero", "inf", "nan", "subnormal"):
+        raise ValueError(f"There is no {method} room")
+
+    if len(view) % 2 != 0:
+        raise ValueError("Odd number of bytes in fp16 array")
+
+    if method in ("zero", "inf"):
+        _check_whole_bytes(len(view) // 2)
+
+    step = max(8, chunk // 2 - chunk // 2 % 8)
+    return _decode_pieces(view, method, step)
+
+
 def decode(
     data: bytes, method: Literal["zero", "inf", "nan", "subnormal", "auto"] = "auto"
 ) -> bytes:
@@ -401,21 +918,7 @@ def decode(
         ValueError: If I can't tell which door you used.
     """
     if method == "auto":
-        if len(data) < 2:
-            raise ValueError("I need more than crumbs to work with")
-
-        first = struct.unpack("<H", data[:2])[0]
-
-        if first == 0 or first == SIGN_BIT:
-            method = "zero"
-        elif (first & EXPONENT_MASK) == INF_BITS and (first & MANTISSA_MASK) == 0:
-            method = "inf"
-        elif (first & 0x7E00) == 0x7E00:
-            method = "nan"
-        elif (first & EXPONENT_MASK) == 0:
-            method = "subnormal"
-        else:
-            raise ValueError("This doesn't look like anything I've made")
+        method = _detect(data)
 
     methods = {
         "zero": from_zero,
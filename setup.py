@@ -0,0 +1,9 @@
+"""Build the optional C kernels. Everything still works if they fail to build."""
+
+from setuptools import Extension, setup
+
+setup(
+    ext_modules=[
+        Extension("notanumber._ext", ["notanumber/_ext.c"], optional=True),
+    ],
+)
@@ -1,10 +1,41 @@
 """Tests for notanumber."""
 
+import array
+import mmap
 import struct
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
 import notanumber as nn
+from notanumber import core
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    """Run without any accelerators, the way the founders intended."""
+    monkeypatch.setattr(core, "np", None)
+    monkeypatch.setattr(core, "_jit", None)
+    monkeypatch.setattr(core, "_ext", None)
+
+
+class TestImport:
+    """Test what importing the package costs."""
+
+    def test_numba_loaded_lazily(self):
+        """Test Numba stays out of sys.modules until a kernel needs it."""
+        pytest.importorskip("numba")
+        code = "import sys, notanumber; print('numba' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert out.stdout.strip() == "False"
 
 
 class TestHighLevelAPI:
@@ -225,6 +256,58 @@ class TestDataIntegrity:
         with pytest.raises(ValueError, match="Wrong kind of small"):
             nn.decode(corrupted, "subnormal")
 
+    @pytest.mark.parametrize(
+        "disabled", [[], ["_ext"], ["_ext", "_jit"], ["_ext", "_jit", "np"]]
+    )
+    @pytest.mark.parametrize(
+        "method, value, message",
+        [
+            ("zero", 0x0001, "Impure zeros"),
+            ("inf", 0x3C00, "Non-infinity"),
+            ("inf", 0x7E00, "NaN snuck"),
+            ("nan", 0x3C00, "pretending to be NaN"),
+            ("subnormal", 0x3C00, "aren't subnormal"),
+            ("subnormal", 0x8001, "Wrong kind of small"),
+        ],
+    )
+    def test_corrupted_last_value(self, monkeypatch, disabled, method, value, message):
+        """Test every backend notices a bad value at the very end."""
+        for backend in disabled:
+            monkeypatch.setattr(core, backend, None)
+        encoded = nn.encode(b"Pure imagination", method)
+        corrupted = encoded[:-2] + struct.pack("<H", value)
+        with pytest.raises(ValueError, match=message):
+            nn.decode(corrupted, method)
+
+    @pytest.mark.parametrize(
+        "disabled", [[], ["_ext"], ["_ext", "_jit"], ["_ext", "_jit", "np"]]
+    )
+    @pytest.mark.parametrize(
+        "method, value, message",
+        [
+            ("nan", 0x3C00, "pretending to be NaN"),
+            ("subnormal", 0x3C00, "aren't subnormal"),
+            ("subnormal", 0x8000, "Wrong kind of small"),
+        ],
+    )
+    def test_corrupted_trailing_value(
+        self, monkeypatch, disabled, method, value, message
+    ):
+        """Test values past the declared length are still validated."""
+        for backend in disabled:
+            monkeypatch.setattr(core, backend, None)
+        corrupted = nn.encode(b"hello world", method) + struct.pack("<H", value)
+        with pytest.raises(ValueError, match=message):
+            nn.decode(corrupted, method)
+        with pytest.raises(ValueError, match=message):
+            b"".join(nn.decode_iter(corrupted, method, 16))
+
+    @pytest.mark.parametrize("method", ["nan", "subnormal"])
+    def test_valid_trailing_value(self, method):
+        """Test well-formed values past the declared length are ignored."""
+        padded = nn.encode(b"hello world", method) + nn.encode(b"", method)
+        assert nn.decode(padded, method) == b"hello world"
+
 
 class TestEdgeCases:
     """Test edge cases and special values."""
@@ -306,5 +389,137 @@ class TestSubnormalEdgeCases:
         assert decoded == b"\xff\x03"
 
 
+class TestStreaming:
+    """Test piecewise encode_iter/decode_iter."""
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    @pytest.mark.parametrize("chunk", [1, 7, 16, 100])
+    def test_pieces_match_one_shot(self, method, chunk):
+        """Test joined pieces equal the one-shot result at any chunk size."""
+        data = bytes(range(256)) * 3
+        encoded = nn.encode(data, method)
+        assert b"".join(nn.encode_iter(data, method, chunk)) == encoded
+        assert b"".join(nn.decode_iter(encoded, method, chunk)) == data
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_pieces_are_bounded(self, method):
+        """Test large inputs really are decoded in several pieces."""
+        data = b"Pure imagination" * 64
+        encoded = nn.encode(data, method)
+        pieces = list(nn.decode_iter(encoded, method, 64))
+        assert len(pieces) > 1
+        assert b"".join(pieces) == data
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_memory_mapped(self, tmp_path, method):
+        """Test a memory-mapped file streams like bytes, both ways."""
+        data = b"Pure imagination" * 64
+        path = tmp_path / "src"
+        path.write_bytes(data)
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as src:
+                encoded = b"".join(nn.encode_iter(src, method, 100))
+        assert encoded == nn.encode(data, method)
+
+        path.write_bytes(encoded)
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as src:
+                decoded = b"".join(nn.decode_iter(src, method, 100))
+        assert decoded == data
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_wide_items(self, method):
+        """Test buffers of 2-byte items stream by bytes, not by items."""
+        np = pytest.importorskip("numpy")
+        data = b"Pure imagination" * 63
+        encoded = nn.encode(data, method)
+        fp16 = np.frombuffer(encoded, np.float16)
+        assert b"".join(nn.decode_iter(fp16, method, 64)) == data
+        assert b"".join(nn.decode_iter(fp16, "auto", 64)) == data
+
+        words = array.array("H", data)
+        assert b"".join(nn.encode_iter(words, method, 9)) == encoded
+
+    def test_invalid_method_is_eager(self):
+        """Test a bad door is reported before iteration starts."""
+        with pytest.raises(ValueError, match="There is no invalid room"):
+            nn.encode_iter(b"test", "invalid")
+        with pytest.raises(ValueError, match="There is no invalid room"):
+            nn.decode_iter(b"\x00\x00", "invalid")
+
+
+class TestSpreadKernels:
+    """Test every zero/inf kernel this CPU can run, not just the one in use."""
+
+    @pytest.mark.parametrize(
+        "kind", core._ext._SPREAD_KERNELS if core._ext is not None else []
+    )
+    @pytest.mark.parametrize("fill, rows", [(0, "_ZERO_ROWS"), (0x7C00, "_INF_ROWS")])
+    def test_matches_rows(self, kind, fill, rows):
+        """Test a kernel against the pure-Python table, across every tail length."""
+        table = getattr(core, rows)
+        for n in [0, 1, 2, 3, 4, 5, 31, 32, 33, 256]:
+            data = bytes(range(256 - n, 256))
+            expected = b"".join(table[b] for b in data)
+            assert core._ext._spread_with(kind, data, fill) == expected
+
+    def test_unknown_kernel(self):
+        """Test asking for a kernel that isn't here."""
+        if core._ext is None:
+            pytest.skip("C extension not built")
+        with pytest.raises(ValueError, match="No imaginary kernel"):
+            core._ext._spread_with("imaginary", b"x", 0)
+
+
+class TestPurePython:
+    """Test the fallback path used when NumPy is not installed."""
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_round_trip(self, pure_python, method):
+        """Test round trip of every byte value without NumPy."""
+        data = bytes(range(256))
+        encoded = nn.encode(data, method)
+        decoded = nn.decode(encoded, method)
+        assert decoded == data
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_matches_accelerated(self, monkeypatch, method):
+        """Test every backend produces identical encodings."""
+        pytest.importorskip("numpy")
+        data = b"Pure imagination" * 3 + b"!!!"
+        accelerated = nn.encode(data, method)
+        for backend in ["_ext", "_jit", "np"]:
+            monkeypatch.setattr(core, backend, None)
+            assert nn.encode(data, method) == accelerated
+            assert nn.decode(accelerated, method) == data
+
+    def test_zero_corrupted(self, pure_python):
+        """Test detection of impure zeros without NumPy."""
+        corrupted = struct.pack("<8H", 0x0001, 0, 0, 0, 0, 0, 0, 0)
+        with pytest.raises(ValueError, match="Impure zeros"):
+            nn.decode(corrupted, "zero")
+
+    def test_inf_corrupted(self, pure_python):
+        """Test detection of a NaN among infinities without NumPy."""
+        corrupted = struct.pack("<8H", *[0x7E00] * 8)
+        with pytest.raises(ValueError, match="NaN snuck"):
+            nn.decode(corrupted, "inf")
+
+    @pytest.mark.parametrize("method", ["nan", "subnormal"])
+    def test_corrupted_header(self, pure_python, method):
+        """Test detection of a bad length header without NumPy."""
+        fill = 0x7E00 | 0xFF if method == "nan" else 0x01FF
+        corrupted = struct.pack("<10H", *[fill] * 10)
+        with pytest.raises(ValueError, match="Corrupted length header"):
+            nn.decode(corrupted, method)
+
+    @pytest.mark.parametrize("method", ["zero", "inf", "nan", "subnormal"])
+    def test_streaming(self, pure_python, method):
+        """Test piecewise round trip without NumPy."""
+        data = bytes(range(256))
+        pieces = nn.encode_iter(data, method, 10)
+        assert b"".join(nn.decode_iter(b"".join(pieces), method, 10)) == data
+
+
 if __name__ == "__main__":
     pytest.main([__file__])